@@ -0,0 +1,69 @@
+"""Compare converting many region folders with one process each against a single batch invocation.
+
+A set of small synthetic region folders is generated (see synthetic_reports.py) and converted through
+the command-line interface twice with a cold cache: once as a separate `python pdf_excel_converter.py
+FOLDER` per folder, the way regions used to be scheduled, and once as one call given every folder, which
+pays interpreter startup and imports once and keeps its worker pool warm across folders.
+
+Run from the repository root:
+
+    python benchmarks/bench_batch.py [--folders 20] [--count 5] [--workers 1]
+"""
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_reports import make_corpus
+
+FOLDERS = 20
+PDFS_PER_FOLDER = 5
+CONVERTER = REPO_ROOT / 'pdf_excel_converter.py'
+
+
+def convert(folders, output_dir, workers):
+    """Wall-clock seconds for one CLI invocation over folders"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, str(CONVERTER), *map(str, folders), '--output-dir', str(output_dir),
+                    '--workers', str(workers), '--no-history'],
+                   cwd=REPO_ROOT, check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--folders', type=int, default=FOLDERS)
+    parser.add_argument('--count', type=int, default=PDFS_PER_FOLDER, help="PDFs per folder")
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("BATCH BENCHMARK")
+    print("="*70 + "\n")
+    print(f"{args.folders} folder(s) x {args.count} PDF(s), {args.workers} worker(s)\n")
+    print(f"{'how':<24} {'total (s)':>10} {'per folder (ms)':>16} {'PDFs/s':>8}")
+    print("-"*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        folders = [tmp / 'regions' / f'region-{i:02d}' for i in range(args.folders)]
+        for seed, folder in enumerate(folders):
+            make_corpus(folder, args.count, seed=seed)
+        pdfs = args.folders * args.count
+
+        for label, run in (
+                ('one process per folder', lambda out: sum(convert([folder], out, args.workers) for folder in folders)),
+                ('one batch invocation', lambda out: convert(folders, out, args.workers))):
+            for folder in folders:
+                (folder / '.extraction_cache.sqlite3').unlink(missing_ok=True)
+            seconds = run(tmp / label.replace(' ', '_'))
+            print(f"{label:<24} {seconds:>10.2f} {seconds / args.folders * 1000:>16.0f} {pdfs / seconds:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Measure the converter's cold-start cost: importing the module in a fresh interpreter.
+
+OCR dependencies are imported lazily, so the second table shows what a run that does hit an
+image-only page pays on top of that.
+
+Run from the repository root:
+
+    python benchmarks/bench_cold_start.py
+"""
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+REPEATS = 10
+
+SNIPPETS = [
+    ('import converter', "import pdf_excel_converter"),
+    ('+ OCR modules', "import pdf_excel_converter, pytesseract, pdf2image"),
+]
+
+
+def time_import(code):
+    """Wall-clock seconds for a fresh interpreter to run code (includes interpreter startup)"""
+    script = (
+        "import time; start = time.perf_counter(); "
+        f"{code}; "
+        "print(time.perf_counter() - start)"
+    )
+    output = subprocess.run([sys.executable, '-c', script], cwd=REPO_ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main():
+    print("\n" + "="*70)
+    print("COLD START BENCHMARK")
+    print("="*70 + "\n")
+    print(f"{'what':<18} {'median (ms)':>12} {'min (ms)':>10} {'max (ms)':>10}")
+    print("-"*70)
+
+    for label, code in SNIPPETS:
+        try:
+            times = [time_import(code) for _ in range(REPEATS)]
+        except subprocess.CalledProcessError as e:
+            print(f"{label:<18} failed: {e.stderr.strip().splitlines()[-1]}")
+            continue
+        print(f"{label:<18} {statistics.median(times) * 1000:>12.0f} {min(times) * 1000:>10.0f} "
+              f"{max(times) * 1000:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Measure PDF discovery on archive-shaped trees of several sizes.
+
+Each tree is laid out like a PMS export archive - year/month/day directories with a folder per
+property inside - and filled with empty placeholder .pdf / .PDF files (discovery never opens them).
+For every size the table shows how long a full sorted rglob takes against iter_pdf_files: the time
+to the first PDF, a whole walk, a one-month date range (whose other directories are never entered)
+and one shard of eight.
+
+Run from the repository root:
+
+    python benchmarks/bench_discovery.py [--sizes 10000 50000 200000] [--properties 20]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+TREE_SIZES = [10000, 50000, 200000]
+PROPERTIES = 20
+FIRST_DAY = date(2023, 1, 1)
+SHARDS = 8
+
+
+def make_tree(root, files, properties):
+    """files placeholder PDFs under root/YYYY/MM/DD/property-NN/, one per property per day; returns the
+    last day used"""
+    day = FIRST_DAY
+    made = 0
+    while made < files:
+        folder = root / f"{day:%Y}" / f"{day:%m}" / f"{day:%d}"
+        for prop in range(min(properties, files - made)):
+            (folder / f"property-{prop:02d}").mkdir(parents=True, exist_ok=True)
+            suffix = '.PDF' if prop % 5 == 0 else '.pdf'
+            (folder / f"property-{prop:02d}" / f"audit_{day:%Y%m%d}{suffix}").touch()
+            made += 1
+        day += timedelta(days=1)
+    return day - timedelta(days=1)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    value = fn()
+    return value, time.perf_counter() - start
+
+
+def main():
+    from pdf_excel_converter import iter_pdf_files
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=TREE_SIZES)
+    parser.add_argument('--properties', type=int, default=PROPERTIES)
+    args = parser.parse_args()
+
+    print("\n" + "="*78)
+    print("DISCOVERY BENCHMARK")
+    print("="*78 + "\n")
+    print(f"{'files':>7} {'rglob (s)':>10} {'first (ms)':>11} {'walk (s)':>9} {'found':>7} "
+          f"{'1 month (ms)':>13} {'found':>6} {f'shard/{SHARDS} (s)':>11}")
+    print("-"*78)
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            last_day = make_tree(root, size, args.properties)
+            month = last_day.replace(day=1)
+
+            _, rglob_seconds = timed(lambda: sorted(root.rglob('*.pdf')))
+            _, first_seconds = timed(lambda: next(iter_pdf_files(root, recursive=True)))
+            found, walk_seconds = timed(lambda: sum(1 for _ in iter_pdf_files(root, recursive=True)))
+            in_month, month_seconds = timed(lambda: sum(1 for _ in iter_pdf_files(
+                root, recursive=True, since=month, until=last_day)))
+            _, shard_seconds = timed(lambda: sum(1 for _ in iter_pdf_files(root, recursive=True, shard=(0, SHARDS))))
+
+            print(f"{size:>7} {rglob_seconds:>10.2f} {first_seconds * 1000:>11.1f} {walk_seconds:>9.2f} {found:>7} "
+                  f"{month_seconds * 1000:>13.1f} {in_month:>6} {shard_seconds:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Compare the standard and write-only Excel report engines at 3, 100 and 1,000 hotels.
+
+Run from the repository root:
+
+    python benchmarks/bench_excel_engines.py
+"""
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pdf_excel_converter import REPORT_METRICS, write_report_standard, write_report_write_only
+
+ENGINES = [
+    ('standard', write_report_standard),
+    ('write_only', write_report_write_only),
+]
+HOTEL_COUNTS = [3, 100, 1000]
+REPEATS = 3
+
+
+def make_hotels(count, seed=0):
+    """Synthetic extracted hotel data in the shape the extractors return"""
+    rng = random.Random(seed)
+    hotels = []
+    for idx in range(count):
+        hotel = {'name': f'Hotel {idx + 1}', 'for_day': {}, 'mtd': {}, 'ytd': {}}
+        for period, scale in (('for_day', 1), ('mtd', 30), ('ytd', 365)):
+            for label, key in REPORT_METRICS:
+                hotel[period][key] = round(rng.uniform(1, 1000) * scale, 2)
+        hotels.append(hotel)
+    return hotels
+
+
+def run(writer, hotels, output_path):
+    """Best wall-clock time over REPEATS runs, then peak traced memory of one more run"""
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        writer(hotels, output_path)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    writer(hotels, output_path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, output_path.stat().st_size
+
+
+def main():
+    print("\n" + "="*70)
+    print("EXCEL ENGINE BENCHMARK")
+    print("="*70 + "\n")
+    print(f"{'hotels':>7} {'engine':<11} {'time (s)':>10} {'peak mem (MB)':>14} {'file (KB)':>10}")
+    print("-"*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in HOTEL_COUNTS:
+            hotels = make_hotels(count)
+            results = {}
+            for name, writer in ENGINES:
+                elapsed, peak, size = run(writer, hotels, Path(tmp) / f'{name}_{count}.xlsx')
+                results[name] = elapsed
+                print(f"{count:>7} {name:<11} {elapsed:>10.3f} {peak / 1e6:>14.1f} {size / 1024:>10.1f}")
+            print(f"{'':>7} speedup {results['standard'] / results['write_only']:.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
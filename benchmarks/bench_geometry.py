@@ -0,0 +1,102 @@
+"""Compare text mode and geometry mode extraction for speed and accuracy on synthetic reports.
+
+Three corpora with the same figures are generated (see synthetic_reports.py): the plain one-line
+layout, the column-aligned layout, and the aligned layout with blank budget / last-year cells and
+stray digits in labels. The plain corpus read in text mode is the reference; every other
+(corpus, mode) pair is timed per file and each extracted value checked against the reference.
+
+Run from the repository root:
+
+    python benchmarks/bench_geometry.py [--count 60] [--perturb 0.3]
+"""
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_reports import make_corpus
+
+COUNT = 60
+MAX_PAGES = 3
+PERTURB = 0.3
+SEED = 0
+TOLERANCE = 0.01
+
+
+def extract_corpus(folder, mode):
+    """{file name: extracted data} and per-file seconds for every PDF in folder"""
+    from pdf_excel_converter import AutoHotelPDFConverter, PERIODS, get_extractor
+
+    converter = AutoHotelPDFConverter(folder, use_cache=False, record_history=False, extraction_mode=mode)
+    results, seconds = {}, []
+    for pdf_path in sorted(Path(folder).glob('*.pdf')):
+        extractor_name = converter.get_extractor_name(pdf_path)
+        converter.last_extract_stats = {}
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            data = get_extractor(extractor_name).run(converter, pdf_path)
+        seconds.append(time.perf_counter() - start)
+        results[pdf_path.name] = {period: data[period] for period in PERIODS}
+    return results, seconds
+
+
+def score(results, reference):
+    """(correct, wrong, missing) values compared with the reference extraction"""
+    correct = wrong = missing = 0
+    for name, expected in reference.items():
+        for period, metrics in expected.items():
+            for metric, value in metrics.items():
+                got = results[name][period].get(metric)
+                if got is None:
+                    missing += 1
+                elif abs(got - value) <= TOLERANCE:
+                    correct += 1
+                else:
+                    wrong += 1
+    return correct, wrong, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=COUNT)
+    parser.add_argument('--perturb', type=float, default=PERTURB)
+    args = parser.parse_args()
+
+    corpora = [
+        ('plain', dict()),
+        ('aligned', dict(aligned=True)),
+        (f'aligned + {args.perturb:.0%} perturbed', dict(aligned=True, perturb=args.perturb)),
+    ]
+
+    print("\n" + "="*78)
+    print("GEOMETRY VS TEXT EXTRACTION BENCHMARK")
+    print("="*78 + "\n")
+    print(f"{'corpus':<26} {'mode':<9} {'ms/file':>8} {'p95 (ms)':>9} {'correct':>8} {'wrong':>6} {'missing':>8}")
+    print("-"*78)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        reference = None
+        for label, options in corpora:
+            folder = Path(tmp) / label.split()[0] / str(len(options))
+            make_corpus(folder, args.count, seed=SEED, max_pages=MAX_PAGES, **options)
+            for mode in ('text', 'geometry'):
+                results, seconds = extract_corpus(folder, mode)
+                if reference is None:
+                    reference = results
+                correct, wrong, missing = score(results, reference)
+                total = correct + wrong + missing
+                p95 = sorted(seconds)[int(0.95 * (len(seconds) - 1))]
+                print(f"{label:<26} {mode:<9} {statistics.mean(seconds) * 1000:>8.1f} {p95 * 1000:>9.1f} "
+                      f"{correct / total:>8.1%} {wrong:>6} {missing:>8}")
+
+
+if __name__ == "__main__":
+    main()
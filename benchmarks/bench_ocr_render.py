@@ -0,0 +1,107 @@
+"""Compare rendering scanned pages for OCR with pdfium against pdf2image (poppler's pdftoppm).
+
+A corpus of scanned TPS Niagara reports is generated (see synthetic_reports.py) and every page is
+rendered through PdfFile.render, as OCREngine does, at the low and high OCR resolutions, once per
+renderer. Each renderer runs in a fresh interpreter so the memory columns are its own: peak RSS growth
+of the Python process over its state after imports, and the largest child process (the pdftoppm runs;
+pdfium has none). Rendering only - tesseract isn't needed. When pdftoppm isn't installed the pdf2image
+rows are skipped.
+
+Run from the repository root:
+
+    python benchmarks/bench_ocr_render.py [--count 10] [--dpi 150 300]
+"""
+import argparse
+import json
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_reports import make_corpus
+
+COUNT = 10
+DPIS = [150, 300]
+MAX_PAGES = 3
+SEED = 0
+
+
+def render_all(folder, renderer, dpi):
+    """Render every page of every scanned PDF in folder; prints per-page seconds and memory as JSON"""
+    import pdf2image  # noqa: F401 - imported up front so it doesn't count towards the peak
+    import pypdfium2  # noqa: F401
+    from pdf_excel_converter import PdfFile
+
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    seconds = []
+    for pdf_path in sorted(Path(folder).glob('*_scan.pdf')):
+        with PdfFile(pdf_path) as pdf_file:
+            page_number = 1
+            while True:
+                start = time.perf_counter()
+                image = pdf_file.render(page_number, dpi, renderer)
+                if image is None:
+                    break
+                image.load()
+                seconds.append(time.perf_counter() - start)
+                page_number += 1
+    print(json.dumps({
+        'seconds': seconds,
+        'peak_mb': (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_kb) / 1024,
+        'child_mb': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+    }))
+
+
+def measure(folder, renderer, dpi):
+    result = subprocess.run([sys.executable, __file__, '--render', str(folder), renderer, str(dpi)],
+                            check=True, capture_output=True, text=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=COUNT, help="scanned TPS reports to generate")
+    parser.add_argument('--dpi', type=int, nargs='+', default=DPIS)
+    parser.add_argument('--render', nargs=3, metavar=('FOLDER', 'RENDERER', 'DPI'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.render:
+        folder, renderer, dpi = args.render
+        render_all(folder, renderer, int(dpi))
+        return
+
+    renderers = ['pdfium']
+    if shutil.which('pdftoppm'):
+        renderers.append('pdf2image')
+
+    print("\n" + "="*78)
+    print("OCR RENDER BENCHMARK")
+    print("="*78 + "\n")
+    if 'pdf2image' not in renderers:
+        print("pdftoppm not found - pdf2image skipped\n")
+    print(f"{'dpi':>5} {'renderer':<11} {'pages':>6} {'ms/page':>8} {'p95 (ms)':>9} {'peak RSS (MB)':>14} "
+          f"{'child RSS (MB)':>15}")
+    print("-"*78)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Only TPS reports are ever scanned, so generate plenty of files and render just the scans
+        make_corpus(tmp, args.count * 3, seed=SEED, scanned_ratio=1.0, max_pages=MAX_PAGES)
+        for dpi in args.dpi:
+            for renderer in renderers:
+                result = measure(tmp, renderer, dpi)
+                pages = result['seconds']
+                p95 = sorted(pages)[int(0.95 * (len(pages) - 1))]
+                print(f"{dpi:>5} {renderer:<11} {len(pages):>6} {statistics.mean(pages) * 1000:>8.1f} "
+                      f"{p95 * 1000:>9.1f} {result['peak_mb']:>14.1f} {result['child_mb']:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Benchmark the full PDF -> Excel pipeline on synthetic corpora of several sizes.
+
+For each corpus size a deterministic set of reports is generated (see synthetic_reports.py) and the
+converter is run on it twice in a fresh interpreter: once cold (empty cache, every PDF parsed) and
+once warm (everything answered from the cache). Throughput, p50/p95 per-file latency, stage timings
+and peak RSS are recorded. Each run is appended to benchmarks/results/pipeline.jsonl together with
+the current git commit and compared with the latest run of a different commit.
+
+Run from the repository root:
+
+    python benchmarks/bench_pipeline.py [--sizes 10 50 200] [--workers 1] [--scanned-ratio 0.2] [--pipeline]
+
+--pipeline runs the converter's staged asyncio pipeline instead of the sequential stages.
+
+Scanned (image-only) reports are only included when tesseract and pdftoppm are installed.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_reports import make_corpus
+
+CORPUS_SIZES = [10, 50, 200]
+SEED = 0
+RESULTS_FILE = Path(__file__).resolve().parent / 'results' / 'pipeline.jsonl'
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile (values need not be sorted)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def max_rss_mb(who):
+    """Peak resident set size of this process or its children, in MB"""
+    rss = resource.getrusage(who).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss / 1e6 if sys.platform == 'darwin' else rss / 1e3
+
+
+def run_pipeline(folder, workers, pipeline=False):
+    """Run the converter once with output silenced and summarise its RunStats"""
+    from pdf_excel_converter import AutoHotelPDFConverter
+
+    converter = AutoHotelPDFConverter(folder, workers=workers, use_cache=True, pipeline=pipeline)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        converter.find_and_process_all_pdfs()
+    wall_clock = time.perf_counter() - start
+
+    summary = converter.run_stats.summary()
+    files = summary['files']
+    latencies = [record['elapsed'] for record in files if not record['cached']]
+    return {
+        'wall_clock': round(wall_clock, 4),
+        'pdfs_per_s': round(len(files) / wall_clock, 2) if wall_clock else None,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2) if latencies else None,
+        'errors': summary['counters'].get('errors', 0),
+        'timings': summary['timings'],
+        'file_timings': summary['file_timings'],
+        'counters': summary['counters'],
+    }
+
+
+def run_child(folder, workers, pipeline):
+    """Child-process entry: cold and warm runs over one corpus, printed as JSON"""
+    cold = run_pipeline(folder, workers, pipeline)
+    warm = run_pipeline(folder, workers, pipeline)
+    print(json.dumps({
+        'cold': cold,
+        'warm': warm,
+        'peak_rss_mb': round(max_rss_mb(resource.RUSAGE_SELF), 1),
+        'peak_rss_workers_mb': round(max_rss_mb(resource.RUSAGE_CHILDREN), 1),
+    }))
+
+
+def benchmark_size(size, workers, scanned_ratio, pipeline=False):
+    with tempfile.TemporaryDirectory() as tmp:
+        make_corpus(tmp, size, seed=SEED, scanned_ratio=scanned_ratio)
+        output = subprocess.run(
+            [sys.executable, __file__, '--run', tmp, '--workers', str(workers)] + (['--pipeline'] if pipeline else []),
+            cwd=REPO_ROOT, check=True, capture_output=True, text=True
+        ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result.update(size=size, workers=workers, scanned_ratio=scanned_ratio, pipeline=pipeline)
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def load_history():
+    if not RESULTS_FILE.exists():
+        return []
+    with open(RESULTS_FILE) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def print_comparison(record, history):
+    """Cold-run deltas against the latest stored run of another commit with the same settings"""
+    previous = next((old for old in reversed(history) if old['commit'] != record['commit']), None)
+    if previous is None:
+        print("\nNo earlier commit to compare with yet.")
+        return
+
+    print(f"\nCompared with {previous['commit']} ({previous['timestamp']}):")
+    def key(r):
+        return r['size'], r['workers'], r['scanned_ratio'], r.get('pipeline', False)
+
+    old_results = {key(r): r for r in previous['results']}
+    for result in record['results']:
+        old = old_results.get(key(result))
+        if old is None:
+            continue
+        changes = []
+        for label, new_value, old_value in (
+                ('PDFs/s', result['cold']['pdfs_per_s'], old['cold']['pdfs_per_s']),
+                ('p95', result['cold']['p95_ms'], old['cold']['p95_ms']),
+                ('peak RSS', result['peak_rss_mb'], old['peak_rss_mb'])):
+            if new_value and old_value:
+                changes.append(f"{label} {(new_value - old_value) / old_value * 100:+.1f}%")
+        print(f"  {result['size']:>5} PDFs: {', '.join(changes)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=CORPUS_SIZES)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--scanned-ratio', type=float, default=0.2)
+    parser.add_argument('--pipeline', action='store_true', help="use the staged asyncio pipeline")
+    parser.add_argument('--no-save', action='store_true', help="don't append this run to the results file")
+    parser.add_argument('--run', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_child(args.run, args.workers, args.pipeline)
+        return
+
+    scanned_ratio = args.scanned_ratio
+    if scanned_ratio and not (shutil.which('tesseract') and shutil.which('pdftoppm')):
+        print("tesseract / pdftoppm not found - benchmarking text-layer PDFs only")
+        scanned_ratio = 0.0
+
+    print("\n" + "="*70)
+    print("PIPELINE BENCHMARK")
+    print("="*70 + "\n")
+    print(f"{'PDFs':>5} {'cold (s)':>9} {'PDFs/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'warm (s)':>9} "
+          f"{'excel (s)':>10} {'peak MB':>8}")
+    print("-"*70)
+
+    results = []
+    for size in args.sizes:
+        result = benchmark_size(size, args.workers, scanned_ratio, args.pipeline)
+        results.append(result)
+        cold, warm = result['cold'], result['warm']
+        excel = cold['timings'].get('excel_build', 0.0) + cold['timings'].get('excel_save', 0.0)
+        print(f"{size:>5} {cold['wall_clock']:>9.2f} {cold['pdfs_per_s']:>8.1f} {cold['p50_ms'] or 0:>9.1f} "
+              f"{cold['p95_ms'] or 0:>9.1f} {warm['wall_clock']:>9.2f} {excel:>10.2f} "
+              f"{max(result['peak_rss_mb'], result['peak_rss_workers_mb']):>8.1f}")
+
+    record = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'results': results,
+    }
+    history = load_history()
+    print_comparison(record, history)
+
+    if not args.no_save:
+        RESULTS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(RESULTS_FILE, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+        print(f"\nResults appended to {RESULTS_FILE.relative_to(REPO_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
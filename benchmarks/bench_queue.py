@@ -0,0 +1,93 @@
+"""Measure job-queue throughput as worker processes are added.
+
+A synthetic corpus (see synthetic_reports.py) is enqueued once per worker count and drained by that
+many `python pdf_excel_converter.py FOLDER --work QUEUE -w 1` processes started together, with the
+extraction cache off so every job is parsed. The table shows the wall-clock time to drain the
+queue, PDFs per second and the speedup over one worker; scaling stops at the number of cores. The
+broker's own cost (a claim and a result write per job, through SQLite) is measured separately.
+
+Run from the repository root:
+
+    python benchmarks/bench_queue.py [--count 120] [--workers 1 2 4]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_reports import make_corpus
+
+COUNT = 120
+WORKERS = [1, 2, 4]
+BROKER_JOBS = 2000
+CONVERTER = REPO_ROOT / 'pdf_excel_converter.py'
+
+
+def drain(folder, queue_path, workers):
+    """Enqueue folder and drain it with workers processes; seconds from starting the workers to the last exit"""
+    options = [str(folder), '--no-cache', '--no-history']
+    subprocess.run([sys.executable, str(CONVERTER), *options, '--enqueue', str(queue_path)],
+                   check=True, capture_output=True)
+    start = time.perf_counter()
+    processes = [subprocess.Popen([sys.executable, str(CONVERTER), *options, '--work', str(queue_path), '-w', '1'],
+                                  stdout=subprocess.DEVNULL)
+                 for _ in range(workers)]
+    for process in processes:
+        process.wait()
+    return time.perf_counter() - start
+
+
+def broker_overhead(queue_path):
+    """Milliseconds per job of claiming it and writing its result back"""
+    from pdf_excel_converter import JobQueue
+
+    queue = JobQueue(queue_path)
+    try:
+        queue.enqueue(f"/nonexistent/report_{i:05d}.pdf" for i in range(BROKER_JOBS))
+        start = time.perf_counter()
+        while True:
+            claimed = queue.claim('bench')
+            if not claimed:
+                break
+            for job_id, _ in claimed:
+                queue.complete(job_id, 'bench', None, None, None)
+        return (time.perf_counter() - start) / BROKER_JOBS * 1000
+    finally:
+        queue.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=COUNT)
+    parser.add_argument('--workers', type=int, nargs='+', default=WORKERS)
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("JOB QUEUE BENCHMARK")
+    print("="*70 + "\n")
+    print(f"{args.count} PDF(s), {os.cpu_count()} core(s)\n")
+    print(f"{'workers':>8} {'drain (s)':>10} {'PDFs/s':>8} {'speedup':>8}")
+    print("-"*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        folder = tmp / 'corpus'
+        make_corpus(folder, args.count, seed=0)
+        baseline = None
+        for workers in args.workers:
+            seconds = drain(folder, tmp / f'queue_{workers}.sqlite3', workers)
+            baseline = baseline or seconds
+            print(f"{workers:>8} {seconds:>10.2f} {args.count / seconds:>8.1f} {baseline / seconds:>7.2f}x")
+
+        print(f"\nBroker: {broker_overhead(tmp / 'broker.sqlite3'):.2f} ms per job (claim + result)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Compare the data-file output sinks with the styled workbook for write time and file size.
+
+The same synthetic hotels (see bench_excel_engines.py) are written through write_outputs as the wide
+and long workbooks and as each output sink on its own (CSV, JSON lines, compressed NumPy archive and,
+when pyarrow is installed, Parquet). The table shows the best of REPEATS write times, the file size,
+and both relative to the write-only wide workbook.
+
+Run from the repository root:
+
+    python benchmarks/bench_sinks.py [--hotels 100 1000 5000]
+"""
+import argparse
+import importlib.util
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_excel_engines import make_hotels
+from pdf_excel_converter import write_outputs
+
+HOTEL_COUNTS = [100, 1000, 5000]
+REPEATS = 3
+# (label, write_outputs options); the first is the baseline the ratios are taken against
+OUTPUTS = [
+    ('xlsx wide', dict(engine='write_only')),
+    ('xlsx long', dict(layout='long')),
+    ('csv', dict(sinks=('csv',), excel=False)),
+    ('jsonl', dict(sinks=('jsonl',), excel=False)),
+    ('npz', dict(sinks=('npz',), excel=False)),
+    ('parquet', dict(sinks=('parquet',), excel=False)),
+]
+
+
+def run(hotels, output_path, options):
+    """Best wall-clock seconds over REPEATS writes and the size of the file written, in bytes"""
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        written = write_outputs(iter(hotels), output_path, **options)
+        best = min(best, time.perf_counter() - start)
+    return best, sum(path.stat().st_size for path in written)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--hotels', type=int, nargs='+', default=HOTEL_COUNTS)
+    args = parser.parse_args()
+
+    outputs = OUTPUTS
+    if importlib.util.find_spec('pyarrow') is None:
+        outputs = [(label, options) for label, options in OUTPUTS if label != 'parquet']
+
+    print("\n" + "="*70)
+    print("OUTPUT SINK BENCHMARK")
+    print("="*70 + "\n")
+    if len(outputs) < len(OUTPUTS):
+        print("pyarrow not installed - parquet skipped\n")
+    print(f"{'hotels':>7} {'output':<10} {'time (s)':>10} {'speedup':>8} {'file (KB)':>10} {'size':>7}")
+    print("-"*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.hotels:
+            hotels = make_hotels(count)
+            baseline = None
+            for label, options in outputs:
+                output_path = Path(tmp) / f"{label.replace(' ', '_')}_{count}.xlsx"
+                elapsed, size = run(hotels, output_path, options)
+                baseline = baseline or (elapsed, size)
+                print(f"{count:>7} {label:<10} {elapsed:>10.3f} {baseline[0] / elapsed:>7.1f}x "
+                      f"{size / 1024:>10.1f} {size / baseline[1]:>6.0%}")
+            print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Compare the pdfplumber and pdfium text backends for speed and agreement on synthetic reports.
+
+Three corpora with the same figures are generated (see synthetic_reports.py): the plain one-line
+layout, the column-aligned layout, and the aligned layout drawn a column at a time, which pdfium
+reads out of row order. For each corpus and backend the table shows the per-page latency of reading
+the text layer alone, the per-file latency of a full extraction, how many files fell back to
+pdfplumber and whether every extracted value matches the pdfplumber backend's.
+
+Run from the repository root:
+
+    python benchmarks/bench_text_backend.py [--count 60]
+"""
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_reports import make_corpus
+
+COUNT = 60
+MAX_PAGES = 3
+SEED = 0
+
+
+def page_latencies(folder, backend):
+    """Seconds to read each page's text layer, over every PDF in folder"""
+    from pdf_excel_converter import open_pdf
+
+    seconds = []
+    for pdf_path in sorted(Path(folder).glob('*.pdf')):
+        with open_pdf(pdf_path, backend) as pdf:
+            for page in pdf.pages:
+                start = time.perf_counter()
+                page.extract_text()
+                seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def extract_corpus(folder, backend):
+    """({file name: extracted data}, per-file seconds, files that fell back to pdfplumber)"""
+    from pdf_excel_converter import AutoHotelPDFConverter, get_extractor
+
+    converter = AutoHotelPDFConverter(folder, use_cache=False, record_history=False, text_backend=backend)
+    results, seconds, fallbacks = {}, [], 0
+    for pdf_path in sorted(Path(folder).glob('*.pdf')):
+        extractor_name = converter.get_extractor_name(pdf_path)
+        converter.last_extract_stats = {}
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[pdf_path.name] = get_extractor(extractor_name).run(converter, pdf_path)
+        seconds.append(time.perf_counter() - start)
+        fallbacks += converter.last_extract_stats.get('text_fallbacks', 0)
+    return results, seconds, fallbacks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=COUNT)
+    args = parser.parse_args()
+
+    corpora = [
+        ('plain', dict()),
+        ('aligned', dict(aligned=True)),
+        ('column order', dict(column_order=True)),
+    ]
+
+    print("\n" + "="*78)
+    print("TEXT BACKEND BENCHMARK")
+    print("="*78 + "\n")
+    print(f"{'corpus':<14} {'backend':<11} {'ms/page':>8} {'p95 (ms)':>9} {'ms/file':>8} {'fallbacks':>10} "
+          f"{'same values':>12}")
+    print("-"*78)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, options in corpora:
+            folder = Path(tmp) / label.replace(' ', '_')
+            make_corpus(folder, args.count, seed=SEED, max_pages=MAX_PAGES, **options)
+            reference = None
+            for backend in ('pdfplumber', 'pdfium'):
+                pages = page_latencies(folder, backend)
+                results, seconds, fallbacks = extract_corpus(folder, backend)
+                if reference is None:
+                    reference = results
+                p95 = sorted(pages)[int(0.95 * (len(pages) - 1))]
+                print(f"{label:<14} {backend:<11} {statistics.mean(pages) * 1000:>8.2f} {p95 * 1000:>9.2f} "
+                      f"{statistics.mean(seconds) * 1000:>8.1f} {fallbacks:>10} "
+                      f"{'yes' if results == reference else 'NO':>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""Generate synthetic hotel-report PDFs in the Candlewood, TPS Niagara and Bayview layouts.
+
+Everything is produced offline and deterministically from a seed: text-layer PDFs are written
+directly (Helvetica text, no extra dependencies) and scanned variants are rendered with Pillow,
+which pdfplumber already depends on. Each report hides its summary block on a random page among
+pages of noisy filler, including near-miss lines the extractors must ignore.
+
+By default each figure follows its label on the same line of text. With aligned=True the figures
+are right-aligned in fixed columns as on the printed reports, and perturb then blanks unused cells
+(budget / last-year columns) and puts stray digits in labels - the cases that shift positional
+parsing - without changing any figure the extractors read.
+
+Run from the repository root to write a corpus to a folder:
+
+    python benchmarks/synthetic_reports.py OUTPUT_DIR COUNT [--scanned-ratio 0.2] [--seed 0] [--aligned]
+        [--perturb 0.3]
+"""
+import argparse
+import random
+from pathlib import Path
+
+FORMATS = ('candlewood', 'tps', 'bayview')
+FILE_PREFIXES = {
+    'candlewood': 'candlewood_burlington',
+    'tps': 'tps_niagara',
+    'bayview': 'bayview_wildwood',
+}
+
+LINES_PER_PAGE = 52
+PAGE_SIZE = (612, 842)
+SCAN_DPI = 100
+
+# Aligned layout: font size, right edge of the last column and column pitch, in points
+ALIGNED_FONT_SIZE = 8
+ALIGNED_RIGHT_EDGE = 582
+ALIGNED_COLUMN_WIDTH = 58
+# Cells no extractor reads (budget / last-year columns), which perturb may blank
+SPARE_COLUMNS = {
+    'candlewood': (),
+    'tps': (1, 3, 5),
+    'bayview': (2, 4),
+}
+# Helvetica advance widths (1/1000 em) of the characters figures are made of
+HELVETICA_WIDTHS = {',': 278, '.': 278, '-': 333, ' ': 278, '%': 889}
+
+
+def _money(value):
+    return f"{value:,.2f}"
+
+
+def _ints(values):
+    return [str(int(value)) for value in values]
+
+
+def row_text(row):
+    """A report row as one line of text: headings and filler are plain strings, figure rows
+    (label, cells) tuples"""
+    if isinstance(row, str):
+        return row
+    label, cells = row
+    return ' '.join([label] + [cell for cell in cells if cell])
+
+
+def _periods(rng, low, high):
+    """for_day / MTD / YTD values that grow the way real period totals do"""
+    day = rng.randint(low, high)
+    return day, day * rng.randint(20, 30), day * rng.randint(250, 330)
+
+
+def candlewood_lines(rng):
+    total = _periods(rng, 80, 160)
+    sold = [int(value * rng.uniform(0.5, 0.95)) for value in total]
+    comp = [rng.randint(0, 3) * (1 + idx * 10) for idx in range(3)]
+    revenue = [value * rng.uniform(110, 180) for value in sold]
+    return [
+        "Night Audit - Candlewood Burlington",
+        "Statistics Today MTD YTD",
+        ("Total Rooms in Hotel", _ints(total)),
+        ("Rooms Occupied", _ints(sold)),
+        # Comp rooms are read as the first three numbers minus the last three
+        ("Rooms Occupied minus Comp", _ints(sold) + _ints(s - c for s, c in zip(sold, comp))),
+        ("% Rooms Occupied", [f"{100 * s / t:.2f}" for s, t in zip(sold, total)]),
+        ("Out of Order Rooms", _ints(rng.randint(0, 4) * (1 + idx * 12) for idx in range(3))),
+        ("ADR minus Comp", [f"{r / s:.2f}" for r, s in zip(revenue, sold)]),
+        ("RevPar", [f"{r / t:.2f}" for r, t in zip(revenue, total)]),
+        ("Room Revenue", [_money(r) for r in revenue]),
+        ("Average Room Revenue", [_money(r / 3) for r in revenue]),
+        ("Food And Beverage Revenue", [_money(r * 0.08) for r in revenue]),
+        ("Other Revenue", [_money(r * 0.02) for r in revenue]),
+        ("Total Revenue", [_money(r * 1.1) for r in revenue]),
+    ]
+
+
+def tps_lines(rng):
+    total = _periods(rng, 80, 160)
+    sold = [int(value * rng.uniform(0.5, 0.95)) for value in total]
+    revenue = [value * rng.uniform(110, 180) for value in sold]
+
+    def row(label, values, fmt=_money):
+        # Actual and budget side by side for each period
+        cells = []
+        for value in values:
+            cells += [fmt(value), fmt(value * 0.95)]
+        return label, cells
+
+    return [
+        "TPS NIAGARA DAILY REPORT",
+        "TODAY'S ACTUAL TODAY'S BUDGET PTD'S ACTUAL PTD'S BUDGET YTD'S ACTUAL YTD'S BUDGET",
+        row("TOTAL ROOM SALES", revenue),
+        row("TOTAL F. & B. SALES", [r * 0.05 for r in revenue]),
+        row("TOTAL MISC. SALES", [r * 0.012 for r in revenue]),
+        row("GROSS HOTEL SALES", [r * 1.062 for r in revenue]),
+        row("# ROOMS OCCUPIED", sold, fmt=lambda value: str(int(value))),
+        row("# TOTAL ROOMS", total, fmt=lambda value: str(int(value))),
+        row("# OUT OF ORDER", [rng.randint(0, 3) * (1 + idx * 10) for idx in range(3)], fmt=lambda value: str(int(value))),
+        row("# COMPLIMENTARY ROOMS", [rng.randint(0, 2) * (1 + idx * 10) for idx in range(3)],
+            fmt=lambda value: str(int(value))),
+        row("OCCUPANCY PCT", [100 * s / t for s, t in zip(sold, total)], fmt=lambda value: f"{value:.2f}"),
+    ]
+
+
+def bayview_lines(rng):
+    total = _periods(rng, 80, 160)
+    sold = [int(value * rng.uniform(0.5, 0.95)) for value in total]
+    revenue = [value * rng.uniform(110, 180) for value in sold]
+
+    def row(label, values, fmt=str, negate_first=False):
+        # Today | MTD | Last Year MTD | YTD | Last Year YTD
+        day, mtd, ytd = values
+        cells = [fmt(-day if negate_first else day), fmt(mtd), fmt(mtd * 0.97), fmt(ytd), fmt(ytd * 0.95)]
+        return label, cells
+
+    return [
+        "Bayview Wildwood Manager Flash",
+        "Today MTD LastYrMTD YTD LastYrYTD",
+        row("Total Rooms", total, fmt=lambda value: str(int(value))),
+        row("Out Of Order", [rng.randint(0, 3) * (1 + idx * 10) for idx in range(3)], fmt=lambda value: str(int(value))),
+        row("Comp Rooms", [rng.randint(0, 3) * (1 + idx * 10) for idx in range(3)], fmt=lambda value: str(int(value))),
+        row("Total Occupied Rooms", sold, fmt=lambda value: str(int(value))),
+        row("ADR for Total Occupied Rooms", [r / s for r, s in zip(revenue, sold)], fmt=lambda value: f"{value:.2f}"),
+        row("RevPar", [r / t for r, t in zip(revenue, total)], fmt=lambda value: f"{value:.2f}"),
+        row("STR RevPar Index", [1.0, 1.0, 1.0], fmt=lambda value: f"{value:.2f}"),
+        row("Occ% of Total Rooms", [100 * s / t for s, t in zip(sold, total)], fmt=lambda value: f"{value:.2f}"),
+        row("Total Room Revenue", revenue, fmt=_money, negate_first=True),
+        row("Other Revenue", [r * 0.02 for r in revenue], fmt=_money, negate_first=True),
+        row("Total Revenue", [r * 1.02 for r in revenue], fmt=_money, negate_first=True),
+    ]
+
+
+SUMMARY_BUILDERS = {
+    'candlewood': candlewood_lines,
+    'tps': tps_lines,
+    'bayview': bayview_lines,
+}
+
+NOISE_TEMPLATES = (
+    "Guest ledger {} {:.2f}",
+    "Folio {} transferred to city ledger {:.2f}",
+    "Room {} late checkout fee {:.2f}",
+    "Deposit ledger balance {} {:.2f}",
+    "Adjustment {} posted by night auditor {:.2f}",
+)
+
+
+def noise_lines(rng, count):
+    return [rng.choice(NOISE_TEMPLATES).format(rng.randint(100, 999), rng.uniform(1, 5000)) for _ in range(count)]
+
+
+def report_pages(fmt, rng, pages=1):
+    """Rows of each page of one report: the summary on a random page, filler on the rest"""
+    summary = SUMMARY_BUILDERS[fmt](rng)
+    summary_page = rng.randrange(pages)
+    result = []
+    for page in range(pages):
+        if page == summary_page:
+            lines = noise_lines(rng, rng.randint(0, 6)) + summary + noise_lines(rng, rng.randint(0, 10))
+        else:
+            lines = noise_lines(rng, LINES_PER_PAGE)
+        result.append(lines[:LINES_PER_PAGE])
+    return result
+
+
+def perturb_pages(pages, fmt, rng, rate):
+    """Blank spare cells of, or add a stray digit to the label of, rate of the figure rows"""
+    result = []
+    for rows in pages:
+        perturbed = []
+        for row in rows:
+            if isinstance(row, tuple) and rng.random() < rate:
+                label, cells = row
+                spare = [column for column in SPARE_COLUMNS[fmt] if column < len(cells)]
+                if spare and rng.random() < 0.5:
+                    blank = set(rng.sample(spare, rng.randint(1, len(spare))))
+                    cells = ['' if column in blank else cell for column, cell in enumerate(cells)]
+                else:
+                    label = f"{label} {rng.randint(1, 9)}"
+                row = (label, cells)
+            perturbed.append(row)
+        result.append(perturbed)
+    return result
+
+
+def _pdf_string(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def _text_width(text, size):
+    return sum(HELVETICA_WIDTHS.get(char, 556) for char in text) * size / 1000
+
+
+def _aligned_stream(rows, height, column_order=False):
+    """Content stream with labels at the left margin and figure cells right-aligned in columns.
+
+    With column_order the labels are drawn first and then each column top to bottom, as some report
+    writers do - the page looks the same, but text in content-stream order no longer reads row by row.
+    """
+    columns = max((len(row[1]) for row in rows if isinstance(row, tuple)), default=0)
+    first_edge = ALIGNED_RIGHT_EDGE - ALIGNED_COLUMN_WIDTH * (columns - 1)
+    size = ALIGNED_FONT_SIZE
+    labels, cells_by_column = [], [[] for _ in range(columns)]
+    for line_idx, row in enumerate(rows):
+        y = height - 40 - 15 * line_idx
+        label, cells = (row, []) if isinstance(row, str) else row
+        labels.append(f'1 0 0 1 30 {y} Tm ({_pdf_string(label)}) Tj')
+        for column, cell in enumerate(cells):
+            if cell:
+                x = first_edge + ALIGNED_COLUMN_WIDTH * column - _text_width(cell, size)
+                cells_by_column[column].append((line_idx, f'1 0 0 1 {x:.2f} {y} Tm ({_pdf_string(cell)}) Tj'))
+
+    if column_order:
+        body = labels + [op for column in cells_by_column for _, op in column]
+    else:
+        by_line = {}
+        for column in cells_by_column:
+            for line_idx, op in column:
+                by_line.setdefault(line_idx, []).append(op)
+        body = [op for line_idx, label in enumerate(labels) for op in [label] + by_line.get(line_idx, [])]
+    return ' '.join([f'BT /F1 {size} Tf'] + body + ['ET']).encode('latin-1')
+
+
+def write_text_pdf(path, pages, aligned=False, column_order=False):
+    """Write a PDF with a real text layer, one line of Helvetica per row of each page (figures in
+    right-aligned columns with aligned=True, drawn a column at a time with column_order=True)"""
+    width, height = PAGE_SIZE
+    kids = ' '.join(f'{4 + 2 * idx} 0 R' for idx in range(len(pages)))
+    bodies = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        f'<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>'.encode(),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+    ]
+    for idx, rows in enumerate(pages):
+        if aligned or column_order:
+            stream = _aligned_stream(rows, height, column_order)
+        else:
+            text = ' '.join(f'({_pdf_string(row_text(row))}) Tj T*' for row in rows)
+            stream = f'BT /F1 10 Tf 15 TL 30 {height - 40} Td {text} ET'.encode('latin-1')
+        bodies.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width} {height}] '
+                      f'/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * idx} 0 R >>'.encode())
+        bodies.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(bodies, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(bodies) + 1)
+    for offset in offsets:
+        out += b'%010d 00000 n \n' % offset
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(bodies) + 1, xref)
+    Path(path).write_bytes(bytes(out))
+
+
+def write_scanned_pdf(path, pages, dpi=SCAN_DPI):
+    """Write an image-only PDF (no text layer), as a scanner would produce"""
+    from PIL import Image, ImageDraw, ImageFont
+
+    scale = dpi / 72
+    size = (int(PAGE_SIZE[0] * scale), int(PAGE_SIZE[1] * scale))
+    try:
+        font = ImageFont.load_default(size=int(10 * scale))
+    except TypeError:
+        # Pillow < 10.1 only has the small bitmap font
+        font = ImageFont.load_default()
+
+    images = []
+    for rows in pages:
+        image = Image.new('L', size, 255)
+        draw = ImageDraw.Draw(image)
+        for idx, row in enumerate(rows):
+            draw.text((30 * scale, (40 + 15 * idx) * scale), row_text(row), fill=0, font=font)
+        images.append(image)
+    images[0].save(path, save_all=True, append_images=images[1:], resolution=dpi)
+
+
+def make_corpus(out_dir, count, seed=0, scanned_ratio=0.0, max_pages=5, aligned=False, perturb=0.0,
+                column_order=False):
+    """Write count reports (formats in rotation) to out_dir and return their paths.
+
+    Page counts vary from 1 to max_pages. scanned_ratio of the TPS reports - the only format the
+    converter OCRs - are written as image-only PDFs. aligned, column_order (aligned, drawn a column
+    at a time) and perturb change only the layout, so any combination of them gives the same figures
+    for the same seed.
+    """
+    rng = random.Random(seed)
+    perturb_rng = random.Random(f"perturb-{seed}")
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    for idx in range(count):
+        fmt = FORMATS[idx % len(FORMATS)]
+        pages = report_pages(fmt, rng, rng.randint(1, max_pages))
+        scanned = fmt == 'tps' and rng.random() < scanned_ratio
+        if perturb:
+            pages = perturb_pages(pages, fmt, perturb_rng, perturb)
+        path = out_dir / f"{FILE_PREFIXES[fmt]}_{idx:05d}{'_scan' if scanned else ''}.pdf"
+        if scanned:
+            write_scanned_pdf(path, pages)
+        else:
+            write_text_pdf(path, pages, aligned=aligned, column_order=column_order)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('output_dir')
+    parser.add_argument('count', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--scanned-ratio', type=float, default=0.0)
+    parser.add_argument('--max-pages', type=int, default=5)
+    parser.add_argument('--aligned', action='store_true', help="put figures in right-aligned columns")
+    parser.add_argument('--perturb', type=float, default=0.0, help="share of figure rows to perturb")
+    parser.add_argument('--column-order', action='store_true',
+                        help="aligned, with each column drawn top to bottom after the labels")
+    args = parser.parse_args()
+
+    paths = make_corpus(args.output_dir, args.count, args.seed, args.scanned_ratio, args.max_pages,
+                        aligned=args.aligned, perturb=args.perturb, column_order=args.column_order)
+    print(f"Wrote {len(paths)} PDF(s) to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DATA = Path(__file__).resolve().parent / 'data'
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / 'benchmarks'))
+
+from synthetic_reports import make_corpus
+
+
+@pytest.fixture
+def reports(tmp_path):
+    """A copy of the sample reports (two one-page PDFs of each format) in a fresh folder, as sorted paths"""
+    folder = tmp_path / 'reports'
+    shutil.copytree(DATA / 'reports', folder)
+    return sorted(folder.glob('*.pdf'))
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """make_corpus(count, **options) into a fresh folder, returning the PDF paths (one of each format per 3)"""
+    def make(count=3, **options):
+        return make_corpus(tmp_path / 'corpus', count, **options)
+    return make
+
+
+# Size in points of the reports' pages
+PAGE_SIZE = (612, 842)
+# A TPS Niagara summary block, as the report prints it
+TPS_SUMMARY = [
+    "TPS NIAGARA DAILY REPORT",
+    "TODAY'S ACTUAL TODAY'S BUDGET PTD'S ACTUAL PTD'S BUDGET YTD'S ACTUAL YTD'S BUDGET",
+    "TOTAL ROOM SALES 13,024.41 12,373.19 321,255.67 305,192.89 3,217,181.86 3,056,322.76",
+    "TOTAL F. & B. SALES 651.22 618.66 16,062.78 15,259.64 160,859.09 152,816.14",
+    "TOTAL MISC. SALES 156.29 148.48 3,855.07 3,662.31 38,606.18 36,675.87",
+    "GROSS HOTEL SALES 13,831.92 13,140.32 341,173.52 324,114.84 3,416,647.13 3,245,814.78",
+    "# ROOMS OCCUPIED 79 75 2448 2325 22441 21318",
+    "# TOTAL ROOMS 129 122 3354 3186 32895 31250",
+    "# OUT OF ORDER 1 0 11 10 42 39",
+    "# COMPLIMENTARY ROOMS 0 0 0 0 42 39",
+    "OCCUPANCY PCT 61.24 58.18 72.99 69.34 68.22 64.81",
+]
+
+
+class FakeTesseract:
+    """Stands in for the pytesseract module: every image reads as low_lines from image_to_data (one line
+    every 15 points down the page) and as high_text from image_to_string"""
+
+    class Output:
+        DICT = 'dict'
+
+    def __init__(self, low_lines, high_text=''):
+        self.low_lines = list(low_lines)
+        self.high_text = high_text
+        # (kind, image size) of every call
+        self.calls = []
+
+    def image_to_data(self, image, config='', output_type=None):
+        self.calls.append(('data', image.size))
+        scale = image.height / PAGE_SIZE[1]
+        words = {key: [] for key in ('text', 'block_num', 'par_num', 'line_num', 'top', 'height')}
+        for line_num, line in enumerate(self.low_lines):
+            for word in line.split():
+                words['text'].append(word)
+                words['block_num'].append(1)
+                words['par_num'].append(1)
+                words['line_num'].append(line_num)
+                words['top'].append(int((40 + 15 * line_num) * scale))
+                words['height'].append(int(10 * scale))
+        return words
+
+    def image_to_string(self, image, config=''):
+        self.calls.append(('string', image.size))
+        return self.high_text
+
+
+@pytest.fixture
+def fake_tesseract(monkeypatch):
+    """install(low_lines, high_text='') puts a FakeTesseract in place of pytesseract and returns it"""
+    def install(low_lines, high_text=''):
+        fake = FakeTesseract(low_lines, high_text)
+        monkeypatch.setitem(sys.modules, 'pytesseract', fake)
+        return fake
+    return install
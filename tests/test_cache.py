@@ -0,0 +1,117 @@
+import dataclasses
+import os
+
+from pdf_excel_converter import _EXTRACTORS, AutoHotelPDFConverter, ExtractionCache, FormatDetector
+
+DATA = {'name': 'Hotel', 'for_day': {'adr': 120.5}, 'mtd': {}, 'ytd': {}}
+
+
+def extract(pdf_paths, **options):
+    """Results of one run's extraction jobs for pdf_paths"""
+    converter = AutoHotelPDFConverter(pdf_paths[0].parent, workers=1, **options)
+    return converter.run_extraction_jobs([(path, converter.get_extractor_name(path)) for path in pdf_paths])
+
+
+def test_extraction_cache_is_keyed_by_version(tmp_path):
+    cache = ExtractionCache(tmp_path / 'cache.sqlite3')
+    try:
+        cache.put('abc', 'extract_candlewood_data', 3, DATA)
+        assert cache.get('abc', 'extract_candlewood_data', 3) == DATA
+        assert cache.get('abc', 'extract_candlewood_data', 4) is None
+        assert cache.get('abc', 'extract_bayview_data', 3) is None
+        cache.clear()
+        assert cache.get('abc', 'extract_candlewood_data', 3) is None
+    finally:
+        cache.close()
+
+
+def test_extraction_cache_evicts_old_then_least_recently_used(tmp_path):
+    cache = ExtractionCache(tmp_path / 'cache.sqlite3')
+    try:
+        for content_hash in ('a', 'b', 'c'):
+            cache.put(content_hash, 'extract_candlewood_data', 1, DATA)
+        cache.get('a', 'extract_candlewood_data', 1)
+        cache.max_bytes = 2 * len(str(DATA))
+        cache.evict()
+        assert cache.get('a', 'extract_candlewood_data', 1) == DATA
+        assert cache.get('b', 'extract_candlewood_data', 1) is None
+
+        cache.max_age_days = -1
+        cache.evict()
+        assert cache.get('a', 'extract_candlewood_data', 1) is None
+    finally:
+        cache.close()
+
+
+def test_unchanged_files_come_from_the_cache(reports):
+    first = extract(reports)
+    second = extract(reports)
+
+    assert [result['cached'] for result in first] == [False] * 6
+    assert [result['cached'] for result in second] == [True] * 6
+    assert [result['data'] for result in second] == [result['data'] for result in first]
+
+
+def test_changed_file_is_parsed_again(reports):
+    extract(reports)
+    with open(reports[0], 'ab') as f:
+        f.write(b'\n% appended\n')
+
+    assert [result['cached'] for result in extract(reports)] == [False] + [True] * 5
+
+
+def test_extractor_version_bump_invalidates_its_results(reports, monkeypatch):
+    extract(reports)
+    plugin = _EXTRACTORS['extract_bayview_data']
+    monkeypatch.setitem(_EXTRACTORS, plugin.name, dataclasses.replace(plugin, version=plugin.version + 1))
+
+    # The sample reports sort as two Bayview files, then Candlewood and TPS
+    assert [result['cached'] for result in extract(reports)] == [False] * 2 + [True] * 4
+
+
+def test_use_cache_false_and_refresh_cache_parse_every_file(reports):
+    extract(reports)
+    assert [result['cached'] for result in extract(reports, use_cache=False)] == [False] * 6
+    assert [result['cached'] for result in extract(reports, refresh_cache=True)] == [False] * 6
+    assert [result['cached'] for result in extract(reports)] == [True] * 6
+
+
+def test_format_detector_caches_scores_until_the_file_changes(reports, tmp_path):
+    pdf_path = next(path for path in reports if path.name.startswith('candlewood_burlington'))
+    detector = FormatDetector(cache_path=tmp_path / 'cache.sqlite3')
+    try:
+        assert detector.detect(pdf_path) == ('extract_candlewood_data', 'content', 'extract_candlewood_data')
+        assert detector.detect(pdf_path)[0] == 'extract_candlewood_data'
+        assert (detector.hits, detector.misses) == (1, 1)
+
+        stat = os.stat(pdf_path)
+        os.utime(pdf_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        detector.detect(pdf_path)
+        assert (detector.hits, detector.misses) == (1, 2)
+    finally:
+        detector.close()
+
+    reopened = FormatDetector(cache_path=tmp_path / 'cache.sqlite3')
+    try:
+        assert reopened.detect(pdf_path)[0] == 'extract_candlewood_data'
+        assert (reopened.hits, reopened.misses) == (1, 0)
+    finally:
+        reopened.close()
+
+
+def test_format_detector_rescores_when_signatures_change(reports, tmp_path):
+    pdf_path = next(path for path in reports if path.name.startswith('candlewood_burlington'))
+    detector = FormatDetector(cache_path=tmp_path / 'cache.sqlite3')
+    try:
+        detector.detect(pdf_path)
+    finally:
+        detector.close()
+
+    signatures = dict(detector.signatures, extract_candlewood_data=(('no such phrase', 1),))
+    changed = FormatDetector(signatures=signatures, cache_path=tmp_path / 'cache.sqlite3')
+    try:
+        # Nothing on the page matches any more, so only the filename decides
+        assert changed.detect(pdf_path) == ('extract_candlewood_data', 'filename', 'extract_candlewood_data')
+        assert (changed.hits, changed.misses) == (0, 1)
+    finally:
+        changed.close()
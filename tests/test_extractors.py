@@ -0,0 +1,106 @@
+import json
+import random
+
+import pytest
+
+from conftest import DATA
+from pdf_excel_converter import PERIODS, AutoHotelPDFConverter, _run_extractor
+from synthetic_reports import LINES_PER_PAGE, make_corpus, noise_lines, report_pages, row_text, write_text_pdf
+
+# What the original per-format extractors (the if-chains the rule-table classifiers replaced) returned for
+# the PDFs under tests/data, keyed by their path there: reports/ holds the sample reports, aligned/ the
+# same formats with figures right-aligned in columns, blank cells and stray digits in labels
+BASELINE = json.loads((DATA / 'baseline_extractions.json').read_text())
+
+
+# Blank cells and digits in labels shifted the original extractors' positions, which geometry mode
+# doesn't reproduce (see test_geometry_mode_reads_perturbed_reports)
+@pytest.mark.parametrize('folder, mode, backend', [
+    ('reports', 'text', 'pdfplumber'),
+    ('reports', 'text', 'pdfium'),
+    ('reports', 'geometry', 'pdfplumber'),
+    ('aligned', 'text', 'pdfplumber'),
+    ('aligned', 'text', 'pdfium'),
+])
+def test_extractors_match_baseline(tmp_path, folder, mode, backend):
+    converter = AutoHotelPDFConverter(tmp_path, workers=1, use_cache=False, extraction_mode=mode,
+                                      text_backend=backend)
+    for name, expected in BASELINE.items():
+        if not name.startswith(f"{folder}/"):
+            continue
+        pdf_path = DATA / name
+        result = _run_extractor(converter, converter.get_extractor_name(pdf_path), pdf_path)
+        assert result['error'] is None
+        assert result['data'] == expected, name
+
+
+def test_geometry_mode_reads_perturbed_reports(tmp_path):
+    """Blank cells and digits in labels shift text mode's positions (as they did the baseline's), but not
+    the columns geometry mode reads by"""
+    clean = make_corpus(tmp_path / 'clean', 15, seed=1, max_pages=1, aligned=True)
+    perturbed = make_corpus(tmp_path / 'perturbed', 15, seed=1, max_pages=1, aligned=True, perturb=0.3)
+    text = AutoHotelPDFConverter(tmp_path, workers=1, use_cache=False)
+    geometry = AutoHotelPDFConverter(tmp_path, workers=1, use_cache=False, extraction_mode='geometry')
+    for clean_path, perturbed_path in zip(clean, perturbed):
+        extractor_name = text.get_extractor_name(clean_path)
+        expected = _run_extractor(text, extractor_name, clean_path)['data']
+        assert _run_extractor(geometry, extractor_name, perturbed_path)['data'] == expected, perturbed_path.name
+
+
+def test_tps_extractor_derives_missing_metrics(reports, tmp_path):
+    """The TPS report doesn't print every metric; the extractor's own output fills them in"""
+    converter = AutoHotelPDFConverter(tmp_path, workers=1, use_cache=False)
+    for pdf_path in [path for path in reports if path.name.startswith('tps_niagara')]:
+        result = _run_extractor(converter, 'extract_tps_niagara_data', pdf_path)
+        for period in PERIODS:
+            figures = result['data'][period]
+            assert figures['adr'] == round(figures['room_revenue'] / figures['rooms_sold'], 2)
+            assert figures['revpar'] == round(figures['room_revenue'] / figures['total_rooms'], 2)
+
+
+def write_report(path, fmt, without=(), filler_pages=0, **layout):
+    """Write a report with its summary on the first page and filler_pages pages of filler after it, leaving
+    out the rows whose labels start with any of without"""
+    rng = random.Random(0)
+    rows = [row for row in report_pages(fmt, rng)[0] if not row_text(row).startswith(without)]
+    write_text_pdf(path, [rows] + [noise_lines(rng, LINES_PER_PAGE) for _ in range(filler_pages)], **layout)
+    return path
+
+
+def extract_with_backends(pdf_path, tmp_path):
+    results = {}
+    for backend in ('pdfplumber', 'pdfium'):
+        converter = AutoHotelPDFConverter(tmp_path, workers=1, use_cache=False, text_backend=backend)
+        results[backend] = _run_extractor(converter, 'extract_tps_niagara_data', pdf_path)
+    return results
+
+
+def test_pdfium_keeps_its_result_for_a_report_without_a_metric(tmp_path):
+    pdf_path = write_report(tmp_path / 'tps_niagara.pdf', 'tps', without=('# COMPLIMENTARY ROOMS',))
+    results = extract_with_backends(pdf_path, tmp_path)
+
+    assert 'comp_rooms' not in results['pdfium']['data']['for_day']
+    assert results['pdfium']['data'] == results['pdfplumber']['data']
+    assert results['pdfium']['stats'].get('text_fallbacks', 0) == 0
+
+
+def test_pdfium_falls_back_when_figures_are_read_apart_from_their_labels(tmp_path):
+    pdf_path = write_report(tmp_path / 'tps_niagara.pdf', 'tps', column_order=True)
+    results = extract_with_backends(pdf_path, tmp_path)
+
+    assert results['pdfium']['stats']['text_fallbacks'] == 1
+    assert results['pdfium']['data'] == results['pdfplumber']['data']
+
+
+@pytest.mark.parametrize('fmt, extractor_name', [
+    ('candlewood', 'extract_candlewood_data'),
+    ('bayview', 'extract_bayview_data'),
+])
+def test_scan_stops_after_a_summary_without_an_optional_line(tmp_path, fmt, extractor_name):
+    pdf_path = write_report(tmp_path / f'{fmt}.pdf', fmt, without=('Other Revenue',), filler_pages=2)
+    converter = AutoHotelPDFConverter(tmp_path, workers=1, use_cache=False)
+    result = _run_extractor(converter, extractor_name, pdf_path)
+
+    assert 'other_revenue' not in result['data']['for_day']
+    assert 'room_revenue' in result['data']['for_day']
+    assert (result['stats']['pages_scanned'], result['stats']['pages_total']) == (1, 3)
@@ -0,0 +1,13 @@
+from pdf_excel_converter import process_folders
+
+
+def test_quiet_run_captures_log_output(reports, tmp_path, capsys):
+    results = process_folders([reports[0].parent], output_dir=tmp_path / 'out', use_cache=False,
+                              record_history=False, log_level='DEBUG')
+
+    assert capsys.readouterr().out == ''
+    [result] = results
+    assert result.errors == {}
+    # print() output and log lines both end up in the folder's captured output
+    assert 'Found 6 PDF file(s)' in result.output
+    assert '[DEBUG] Final extracted data' in result.output
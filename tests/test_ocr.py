@@ -0,0 +1,118 @@
+import gc
+import weakref
+
+import pytest
+
+from conftest import PAGE_SIZE, TPS_SUMMARY
+from pdf_excel_converter import (PERIODS, TPS_NIAGARA_CLASSIFIER, AutoHotelPDFConverter, OCRCache, OCREngine,
+                                 PdfFile, _run_extractor)
+
+LOW_DPI = 50
+HIGH_DPI = 100
+# A report page rendered at HIGH_DPI
+HIGH_DPI_SIZE = (round(PAGE_SIZE[0] * HIGH_DPI / 72), round(PAGE_SIZE[1] * HIGH_DPI / 72))
+
+
+@pytest.fixture
+def scanned_tps(corpus):
+    """A one-page image-only TPS report"""
+    path = corpus(3, max_pages=1, scanned_ratio=1.0)[1]
+    assert path.name.endswith('_scan.pdf')
+    return path
+
+
+def ocr(pdf_path, cache=None):
+    engine = OCREngine(TPS_NIAGARA_CLASSIFIER, low_dpi=LOW_DPI, high_dpi=HIGH_DPI, threads=1, cache=cache)
+    with PdfFile(pdf_path) as pdf_file:
+        text = engine.ocr_page(pdf_file, 1)
+    data = {period: {} for period in PERIODS}
+    TPS_NIAGARA_CLASSIFIER.apply_text(text, data)
+    return engine, data
+
+
+def test_complete_low_dpi_pass_is_not_escalated(scanned_tps, fake_tesseract):
+    fake = fake_tesseract(TPS_SUMMARY)
+    engine, data = ocr(scanned_tps)
+
+    assert engine.escalated == 0
+    assert [kind for kind, size in fake.calls] == ['data']
+    assert TPS_NIAGARA_CLASSIFIER.is_complete(data)
+
+
+def test_missing_metric_escalates_to_a_crop_of_the_label_rows(scanned_tps, fake_tesseract):
+    low_lines = [line for line in TPS_SUMMARY if not line.startswith('# ROOMS OCCUPIED')]
+    fake = fake_tesseract(low_lines, high_text='\n'.join(TPS_SUMMARY))
+    engine, data = ocr(scanned_tps)
+
+    assert engine.escalated == 1
+    assert [kind for kind, size in fake.calls] == ['data', 'string']
+    width, height = fake.calls[1][1]
+    # Full width at high DPI, but only the band of rows around the labels
+    assert width == HIGH_DPI_SIZE[0]
+    assert height < HIGH_DPI_SIZE[1] / 2
+    assert TPS_NIAGARA_CLASSIFIER.is_complete(data)
+
+
+def test_page_without_text_escalates_to_the_whole_page(scanned_tps, fake_tesseract):
+    fake = fake_tesseract([], high_text='\n'.join(TPS_SUMMARY))
+    engine, data = ocr(scanned_tps)
+
+    assert engine.escalated == 1
+    assert fake.calls[1] == ('string', HIGH_DPI_SIZE)
+    assert TPS_NIAGARA_CLASSIFIER.is_complete(data)
+
+
+def test_ocr_cache_answers_repeat_pages(scanned_tps, fake_tesseract, tmp_path):
+    fake = fake_tesseract(TPS_SUMMARY[:3], high_text='\n'.join(TPS_SUMMARY))
+    cache = OCRCache(tmp_path / 'ocr.sqlite3')
+    try:
+        first, first_data = ocr(scanned_tps, cache)
+        calls = len(fake.calls)
+        second, second_data = ocr(scanned_tps, cache)
+    finally:
+        cache.close()
+
+    assert calls == 2
+    assert len(fake.calls) == calls
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert second_data == first_data
+
+
+def test_ocr_cache_is_only_opened_when_a_page_is_ocrd(reports, scanned_tps, fake_tesseract, monkeypatch):
+    fake_tesseract(TPS_SUMMARY)
+    opened = []
+    connect = OCRCache._connect
+
+    def spy(cache):
+        opened.append(cache.conn is None)
+        connect(cache)
+
+    monkeypatch.setattr(OCRCache, '_connect', spy)
+    text_tps = next(path for path in reports if path.name.startswith('tps_niagara'))
+    converter = AutoHotelPDFConverter(text_tps.parent, workers=1, record_history=False)
+    assert _run_extractor(converter, 'extract_tps_niagara_data', text_tps)['data']['for_day']
+    assert opened == []
+
+    result = _run_extractor(converter, 'extract_tps_niagara_data', scanned_tps)
+    assert result['stats']['ocr_pages'] == 1
+    assert opened and opened[0]
+
+
+def test_rendered_pages_are_released(scanned_tps, fake_tesseract, monkeypatch):
+    fake_tesseract([], high_text='\n'.join(TPS_SUMMARY))
+    rendered = []
+    render = PdfFile.render
+
+    def spy(pdf_file, *args):
+        image = render(pdf_file, *args)
+        rendered.append(weakref.ref(image))
+        return image
+
+    monkeypatch.setattr(PdfFile, 'render', spy)
+    engine = OCREngine(TPS_NIAGARA_CLASSIFIER, low_dpi=LOW_DPI, high_dpi=HIGH_DPI, threads=1)
+    with PdfFile(scanned_tps) as pdf_file:
+        engine.ocr_page(pdf_file, 1)
+        gc.collect()
+        # Both tiers were rendered, and neither image outlives ocr_page()
+        assert len(rendered) == 2
+        assert [ref() for ref in rendered] == [None, None]
@@ -0,0 +1,107 @@
+import errno
+import shutil
+
+import pytest
+
+from pdf_excel_converter import (OUT_OF_MEMORY_ERROR, AutoHotelPDFConverter, PdfFile, Quarantine, _first_page_text,
+                                 _out_of_memory, _run_extractor, resource)
+
+
+def out_of_memory(*args, **kwargs):
+    raise MemoryError
+
+
+def test_timeout_quarantines_without_locking_the_cache(corpus, tmp_path):
+    """A file stopped during detection is quarantined while the detector still has cached scores pending"""
+    first, second = corpus(2)
+    folder = tmp_path / 'reports'
+    folder.mkdir()
+    shutil.copy(first, folder)
+    AutoHotelPDFConverter(folder, workers=1, record_history=False).find_and_process_all_pdfs()
+
+    shutil.copy(second, folder)
+    converter = AutoHotelPDFConverter(folder, workers=1, record_history=False, file_timeout=0.0001)
+    converter.find_and_process_all_pdfs()
+
+    reasons = {entry['path']: entry['reason'] for entry in converter.quarantined_files()}
+    assert reasons == {str((folder / second.name).resolve()): 'timed out after 0.0001s'}
+    assert converter.run_stats.counters['quarantined'] == 1
+
+
+@pytest.mark.skipif(resource is None, reason="memory caps need the resource module")
+def test_memory_cap_quarantines_during_extraction(corpus):
+    """With detection answered from the format cache, a file that runs out of memory while being extracted
+    is quarantined instead of adding an empty hotel to the report"""
+    folder = corpus(3)[0].parent
+    AutoHotelPDFConverter(folder, workers=1, record_history=False).detect_extractors(sorted(folder.glob('*.pdf')))
+
+    converter = AutoHotelPDFConverter(folder, workers=1, record_history=False, refresh_cache=True,
+                                      file_memory_mb=1)
+    converter.find_and_process_all_pdfs()
+
+    assert converter.hotels_data == []
+    assert [entry['reason'] for entry in converter.quarantined_files()] == ["memory limit of 1 MB exceeded"] * 3
+
+
+def test_quarantined_file_is_skipped_until_it_changes(reports):
+    first = reports[0]
+    options = dict(workers=1, use_cache=False, record_history=False)
+    quarantine = Quarantine(AutoHotelPDFConverter(first.parent, **options).cache_path)
+    quarantine.add(first, 'timed out after 1s')
+    quarantine.close()
+
+    converter = AutoHotelPDFConverter(first.parent, **options)
+    converter.find_and_process_all_pdfs()
+    assert converter.hotel_sources == reports[1:]
+    assert converter.run_stats.counters['quarantine_skipped'] == 1
+
+    with open(first, 'ab') as f:
+        f.write(b'\n')
+    converter = AutoHotelPDFConverter(first.parent, **options)
+    converter.find_and_process_all_pdfs()
+    assert converter.hotel_sources == reports
+    # The stale entry stays until it is released
+    assert converter.release_quarantine() == 1
+    assert converter.quarantined_files() == []
+
+
+def test_released_file_is_processed_again(reports):
+    first, second = reports[:2]
+    options = dict(workers=1, use_cache=False, record_history=False)
+    quarantine = Quarantine(AutoHotelPDFConverter(first.parent, **options).cache_path)
+    quarantine.add(first, 'memory limit of 1 MB exceeded')
+    quarantine.add(second, 'memory limit of 1 MB exceeded')
+    quarantine.close()
+
+    converter = AutoHotelPDFConverter(first.parent, **options)
+    assert converter.release_quarantine(first) == 1
+    converter.find_and_process_all_pdfs()
+    assert converter.hotel_sources == [first] + reports[2:]
+    assert [entry['path'] for entry in converter.quarantined_files()] == [str(second.resolve())]
+
+
+def test_tps_extractor_lets_memory_errors_through(reports, monkeypatch):
+    tps = next(path for path in reports if path.name.startswith('tps_niagara'))
+    monkeypatch.setattr(AutoHotelPDFConverter, 'scan_document', out_of_memory)
+    converter = AutoHotelPDFConverter(tps.parent, workers=1, use_cache=False, record_history=False)
+    result = _run_extractor(converter, 'extract_tps_niagara_data', tps)
+
+    assert result['data'] is None
+    assert result['error'] == OUT_OF_MEMORY_ERROR
+
+
+def test_first_page_text_lets_memory_errors_through(reports, monkeypatch):
+    monkeypatch.setattr(PdfFile, 'page_text', out_of_memory)
+    with pytest.raises(MemoryError):
+        _first_page_text(reports[0], 100)
+
+
+@pytest.mark.parametrize('error, expected', [
+    (MemoryError(), True),
+    (OSError(errno.ENOMEM, "Cannot allocate memory"), True),
+    (ImportError("libpdfium.so: failed to map segment from shared object"), True),
+    (OSError(errno.ENOENT, "No such file or directory"), False),
+    (ValueError("bad xref"), False),
+])
+def test_out_of_memory(error, expected):
+    assert _out_of_memory(error) is expected
@@ -0,0 +1,76 @@
+import pytest
+
+from pdf_excel_converter import AutoHotelPDFConverter, JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(tmp_path / 'queue.sqlite3', max_attempts=2)
+    yield queue
+    queue.close()
+
+
+def test_enqueue_ignores_files_already_queued(queue, tmp_path):
+    paths = [tmp_path / f'report_{i}.pdf' for i in range(3)]
+    assert queue.enqueue(paths) == 3
+    assert queue.enqueue(paths[1:] + [tmp_path / 'report_3.pdf']) == 1
+    assert queue.counts() == {'pending': 4}
+
+
+def test_claim_and_complete(queue, tmp_path):
+    paths = [tmp_path / f'report_{i}.pdf' for i in range(3)]
+    queue.enqueue(paths)
+
+    claimed = queue.claim('a', limit=2)
+    assert [path for _, path in claimed] == paths[:2]
+    assert [path for _, path in queue.claim('b', limit=2)] == paths[2:]
+    assert queue.claim('c') == []
+
+    for job_id, _ in claimed:
+        assert queue.complete(job_id, 'a', 'extract_candlewood_data', None, {'data': {'name': 'x'}})
+    assert queue.counts() == {'done': 2, 'leased': 1}
+    assert not queue.finished()
+    assert [(path, result) for path, _, _, result in queue.results()] == [
+        (paths[0], {'data': {'name': 'x'}}), (paths[1], {'data': {'name': 'x'}})]
+
+
+def test_expired_lease_is_taken_over(queue, tmp_path):
+    queue.enqueue([tmp_path / 'report.pdf'])
+    [(job_id, _)] = queue.claim('a', lease_seconds=-1)
+
+    assert queue.claim('b') == [(job_id, (tmp_path / 'report.pdf').resolve())]
+    # The first worker finishing late doesn't overwrite the new holder's result
+    assert not queue.complete(job_id, 'a', None, 'late', None)
+    assert queue.complete(job_id, 'b', None, 'on time', None)
+    assert [note for _, _, note, _ in queue.results()] == ['on time']
+    assert queue.finished()
+
+
+def test_job_fails_after_max_attempts(queue, tmp_path):
+    queue.enqueue([tmp_path / 'report.pdf'])
+    queue.claim('a', lease_seconds=-1)
+    queue.claim('b', lease_seconds=-1)
+
+    assert queue.claim('c') == []
+    assert queue.counts() == {'failed': 1}
+    assert queue.finished()
+    [(path, extractor_name, note, result)] = queue.results()
+    assert (extractor_name, result) == (None, None)
+    assert 'given up after 2 expired lease(s)' in note
+
+
+def test_workers_and_merge_match_a_normal_run(corpus, tmp_path):
+    folder = corpus(6, max_pages=1)[0].parent
+    queue_path = tmp_path / 'queue.sqlite3'
+    options = dict(workers=1, use_cache=False, record_history=False)
+
+    AutoHotelPDFConverter(folder, **options).enqueue_pdfs(queue_path)
+    for worker in ('a', 'b'):
+        AutoHotelPDFConverter(folder, **options).work_queue(queue_path, worker=worker, wait=False)
+    merged = AutoHotelPDFConverter(folder, report_path=tmp_path / 'merged.xlsx', **options)
+    merged.merge_queue(queue_path)
+
+    normal = AutoHotelPDFConverter(folder, report_path=tmp_path / 'normal.xlsx', **options)
+    normal.find_and_process_all_pdfs()
+    assert merged.hotels_data == normal.hotels_data
+    assert merged.hotel_sources == normal.hotel_sources
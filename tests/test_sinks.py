@@ -0,0 +1,41 @@
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from pdf_excel_converter import PERIODS, SINK_COLUMNS, AutoHotelPDFConverter, write_outputs
+
+
+def test_sinks_hold_the_same_rows(reports, tmp_path):
+    report_path = tmp_path / 'report.xlsx'
+    converter = AutoHotelPDFConverter(reports[0].parent, workers=1, use_cache=False, record_history=False,
+                                      report_path=report_path, sinks=('csv', 'jsonl', 'npz'), excel=False)
+    converter.find_and_process_all_pdfs()
+    assert not report_path.exists()
+
+    with open(report_path.with_suffix('.csv'), newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        assert tuple(next(reader)) == SINK_COLUMNS
+        csv_rows = [row[:4] + [float(row[4]) if row[4] else None] for row in reader]
+    with open(report_path.with_suffix('.jsonl'), encoding='utf-8') as f:
+        # A missing business date is an empty field in CSV and NPZ but null in JSON Lines
+        jsonl_rows = [[field if field is not None or column != 'business_date' else ''
+                       for column, field in json.loads(line).items()] for line in f]
+    with np.load(report_path.with_suffix('.npz')) as npz:
+        npz_rows = [[str(npz[column][i]) for column in SINK_COLUMNS[:4]] +
+                    [None if np.isnan(npz['value'][i]) else float(npz['value'][i])]
+                    for i in range(len(npz['value']))]
+
+    assert csv_rows == jsonl_rows == npz_rows
+    assert {row[0] for row in csv_rows} == {hotel['name'] for hotel in converter.hotels_data}
+
+
+def test_failed_write_removes_partial_files(tmp_path):
+    def hotels():
+        yield {'name': 'Hotel', 'business_date': None, **{period: {} for period in PERIODS}}
+        raise RuntimeError("extraction failed")
+
+    with pytest.raises(RuntimeError):
+        write_outputs(hotels(), tmp_path / 'report.xlsx', sinks=('csv', 'jsonl'), excel=False)
+    assert list(tmp_path.iterdir()) == []